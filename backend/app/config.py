@@ -19,6 +19,11 @@ class Settings(BaseSettings):
     # AI Configuration
     MODEL_NAME: str = "all-MiniLM-L6-v2"
 
+    # Query Log & Startup Warm-up
+    QUERY_LOG_ENABLED: bool = True
+    WARMUP_QUERY_COUNT: int = 50     # Most frequent recent queries replayed at startup (0 disables)
+    WARMUP_LOG_WINDOW: int = 10000   # How many recent log records count as "recent"
+
     # Path Configuration
     # We calculate base path relative to this file to ensure robustness
     BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
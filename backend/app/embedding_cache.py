@@ -0,0 +1,156 @@
+import os
+import hashlib
+import numpy as np
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMBEDDING_CACHE_DIR = os.path.join(BASE_DIR, "data", "embedding_cache")
+
+# Config
+MIN_FLUSH_ENTRIES = 5000  # Pending entries before the index is merged and rewritten
+
+class EmbeddingCache:
+    """
+    Content-addressed, persistent store of encoder outputs.
+    - Key: 64-bit blake2b hash of (model name + whitespace-normalized input text),
+      so changing the model can never return a stale vector
+    - Vectors: append-only raw float32 file, read back through np.memmap
+    - Index: two parallel arrays (sorted hashes, row numbers), 16 bytes per entry,
+      looked up in bulk with np.searchsorted. New entries are buffered in memory
+      and merged into the index by flush(), not on every store.
+    """
+
+    def __init__(self, model_name: str, dim: int, cache_dir: str = EMBEDDING_CACHE_DIR):
+        self.model_name = model_name
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.vectors_path = os.path.join(cache_dir, f"vectors_{dim}d.f32")
+        self.index_path = os.path.join(cache_dir, f"index_{dim}d.npz")
+        self.pending = {}  # hash -> row, stored but not yet merged into the index
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.rows = np.empty(0, dtype=np.int64)
+        if os.path.exists(self.index_path):
+            with np.load(self.index_path) as index:
+                self.hashes = index["hashes"]
+                self.rows = index["rows"]
+
+    @staticmethod
+    def normalize_input(text: str) -> str:
+        # Whitespace does not change the tokenizer output, so it must not change the key
+        return " ".join(text.split())
+
+    def key(self, text: str) -> int:
+        payload = f"{self.model_name}\0{self.normalize_input(text)}".encode("utf-8")
+        return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "little")
+
+    def _row_count(self) -> int:
+        """Complete rows in the data file (a torn trailing row is not counted)."""
+        if not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // self.row_bytes
+
+    def _find_rows(self, keys):
+        """Row number for each key, or -1 if it is not cached."""
+        found_rows = np.full(len(keys), -1, dtype=np.int64)
+        if len(self.hashes):
+            pos = np.minimum(np.searchsorted(self.hashes, keys), len(self.hashes) - 1)
+            found = self.hashes[pos] == keys
+            found_rows[found] = self.rows[pos[found]]
+        if self.pending:
+            for i in np.flatnonzero(found_rows < 0):
+                found_rows[i] = self.pending.get(int(keys[i]), -1)
+        return found_rows
+
+    def lookup(self, texts):
+        """
+        Returns (vectors, miss_positions). Rows of `vectors` for cache hits are
+        filled in; rows listed in miss_positions still need encoding.
+        """
+        keys = np.array([self.key(t) for t in texts], dtype=np.uint64)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        found_rows = self._find_rows(keys)
+        found = found_rows >= 0
+        if found.any():
+            stored = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._row_count(), self.dim))
+            vectors[found] = stored[found_rows[found]]
+            del stored
+
+        self.hits += int(found.sum())
+        self.misses += int((~found).sum())
+        return vectors, np.flatnonzero(~found)
+
+    def store(self, texts, vectors):
+        """Appends new vectors to the data file; their index entries stay pending until flush()."""
+        if len(texts) == 0:
+            return
+
+        keys = np.array([self.key(t) for t in texts], dtype=np.uint64)
+        keys, first = np.unique(keys, return_index=True)
+        new = self._find_rows(keys) < 0
+        keys, first = keys[new], first[new]
+        if len(keys) == 0:
+            return
+
+        start_row = self._row_count()
+        with open(self.vectors_path, "ab") as f:
+            # Drop a torn row left by an interrupted append, so new rows land
+            # at the byte offset their row number implies
+            f.truncate(start_row * self.row_bytes)
+            f.write(np.ascontiguousarray(vectors[first], dtype=np.float32).tobytes())
+
+        for offset, key in enumerate(keys.tolist()):
+            self.pending[key] = start_row + offset
+
+        # Threshold grows with the index, so total index rewrites stay linear in
+        # corpus size while an interrupted run loses only a bounded tail
+        if len(self.pending) >= max(MIN_FLUSH_ENTRIES, len(self.hashes) // 2):
+            self.flush()
+
+    def flush(self):
+        """Merges pending entries into the sorted index and persists it once."""
+        if not self.pending:
+            return
+
+        new_hashes = np.fromiter(self.pending.keys(), dtype=np.uint64, count=len(self.pending))
+        new_rows = np.fromiter(self.pending.values(), dtype=np.int64, count=len(self.pending))
+        order = np.argsort(new_hashes)
+        new_hashes, new_rows = new_hashes[order], new_rows[order]
+
+        # Linear merge of two sorted runs
+        pos = np.searchsorted(self.hashes, new_hashes)
+        self.hashes = np.insert(self.hashes, pos, new_hashes)
+        self.rows = np.insert(self.rows, pos, new_rows)
+        self.pending = {}
+
+        # Index is written after the vectors, atomically, so a crash can only
+        # leave unreferenced rows at the end of the data file
+        tmp_path = self.index_path + ".tmp.npz"
+        np.savez(tmp_path, hashes=self.hashes, rows=self.rows)
+        os.replace(tmp_path, self.index_path)
+
+    def encode(self, model, texts, batch_size: int = 32):
+        """Encodes only cache misses and returns vectors for all `texts`, in order."""
+        vectors, misses = self.lookup(texts)
+        if len(misses):
+            miss_texts = [self.normalize_input(texts[i]) for i in misses]
+            encoded = model.encode(miss_texts, batch_size=batch_size)
+            vectors[misses] = encoded
+            self.store(miss_texts, encoded)
+        return vectors
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 4),
+            "entries": int(len(self.hashes) + len(self.pending))
+        }
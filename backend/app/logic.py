@@ -1,48 +1,243 @@
 import os
 import json
 import time
+from collections import OrderedDict
 import numpy as np
 from app.ai_core import ModelManager
-from app.text_utils import normalize_text
+from app.text_utils import normalize_text, corpus_fingerprint, passages_fingerprint
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data", "processed")
 METADATA_PATH = os.path.join(DATA_DIR, "metadata.json")
 EMBEDDINGS_PATH = os.path.join(DATA_DIR, "embeddings.npy")
+PASSAGE_EMBEDDINGS_PATH = os.path.join(DATA_DIR, "passage_embeddings.npy")
+PASSAGE_OFFSETS_PATH = os.path.join(DATA_DIR, "passage_offsets.npy")
+PASSAGE_META_PATH = os.path.join(DATA_DIR, "passage_meta.json")
+TOPICS_ARRAYS_PATH = os.path.join(DATA_DIR, "topics.npz")
+TOPICS_META_PATH = os.path.join(DATA_DIR, "topics.json")
+
+# Config
+QUERY_CACHE_SIZE = 1024  # Encoded query vectors kept in memory (LRU)
 
 class SearchEngine:
     def __init__(self):
         self.model = None
         self.papers = []
+        self.corpus_fingerprint = None
         self.embeddings = None
+        self.passage_embeddings = None
+        self.passage_offsets = None
+        self.topics = []
+        self.topic_centroids = None
+        self.topic_member_order = None
+        self.topic_member_offsets = None
+        self.query_cache = OrderedDict()
+        self.data_loaded = False
         self.is_ready = False
         self.model_manager = ModelManager()
 
     def initialize(self):
-        """Loads model and data."""
+        """Loads data and model."""
         if self.is_ready:
             return
 
         print("⏳ Search Engine: Loading Resources...")
 
-        # 1. Load Model (Phase 3.1)
+        # 1. Load Data (no model needed; topic browsing works from here on)
+        self.load_data()
+
+        # 2. Load Model (Phase 3.1)
         self.model = self.model_manager.load_model()
 
-        # 2. Load Data
+        self.is_ready = True
+        print(f"✅ Search Engine Online. Index Size: {len(self.papers)}")
+
+    @property
+    def topics_ready(self):
+        return bool(self.topics)
+
+    def load_data(self):
+        """Loads metadata, vectors and precomputed indexes. Independent of the model."""
+        if self.data_loaded:
+            return
+
         if not os.path.exists(METADATA_PATH) or not os.path.exists(EMBEDDINGS_PATH):
             raise FileNotFoundError("Processed data not found.")
 
         with open(METADATA_PATH, 'r', encoding='utf-8') as f:
             self.papers = json.load(f)
+        self.corpus_fingerprint = corpus_fingerprint(self.papers)
 
         self.embeddings = np.load(EMBEDDINGS_PATH)
-        self.is_ready = True
-        print(f"✅ Search Engine Online. Index Size: {len(self.papers)}")
 
-    def search(self, raw_query: str, top_k: int = 5):
+        # Passages (optional, produced by process_embeddings.py --passages)
+        self.load_passages()
+
+        # Topics (optional, produced offline by scripts/cluster_topics.py)
+        self.load_topics()
+
+        self.data_loaded = True
+
+    def load_passages(self):
+        """Loads multi-vector passage embeddings (CSR layout) if they were generated."""
+        paths = (PASSAGE_EMBEDDINGS_PATH, PASSAGE_OFFSETS_PATH, PASSAGE_META_PATH)
+        if not all(os.path.exists(p) for p in paths):
+            return
+
+        with open(PASSAGE_META_PATH, 'r', encoding='utf-8') as f:
+            passage_meta = json.load(f)
+
+        if passage_meta.get("corpus_fingerprint") != self.corpus_fingerprint:
+            print("⚠️ Passage index was built for a different corpus. Using single-vector search.")
+            return
+
+        if passage_meta.get("model_name") != self.model_manager.model_name:
+            print("⚠️ Passage index was built with a different model. Using single-vector search.")
+            return
+
+        max_words = passage_meta.get("max_words", 100)
+        if passage_meta.get("passages_fingerprint") != passages_fingerprint(self.papers, max_words):
+            print("⚠️ Passage index was built from different paper texts. Using single-vector search.")
+            return
+
+        passage_embeddings = np.load(PASSAGE_EMBEDDINGS_PATH)
+        passage_offsets = np.load(PASSAGE_OFFSETS_PATH)
+
+        if (passage_offsets.shape[0] != len(self.papers) + 1
+                or passage_offsets[-1] != passage_embeddings.shape[0]
+                or passage_embeddings.shape[1] != self.embeddings.shape[1]):
+            print("⚠️ Passage index is stale (size mismatch). Using single-vector search.")
+            return
+
+        self.passage_embeddings = passage_embeddings
+        self.passage_offsets = passage_offsets
+
+        extra_mb = (passage_embeddings.nbytes + passage_offsets.nbytes) / (1024 ** 2)
+        print(
+            f"   ↳ Passage index loaded: {passage_embeddings.shape[0]} passages "
+            f"(+{extra_mb:.2f} MB over {self.embeddings.nbytes / (1024 ** 2):.2f} MB)."
+        )
+
+    def score_papers(self, query_vector, candidates=None):
+        """
+        Scores papers against the query (all papers, or only `candidates`).
+        Single-vector: one dot product per paper.
+        Multi-vector: one dot product per passage, then a segmented max
+        (np.maximum.reduceat over the CSR offsets) gives each paper its best passage.
+        Returns (scores, rows_scanned).
+        """
+        if self.passage_embeddings is None:
+            if candidates is None:
+                return np.dot(self.embeddings, query_vector), len(self.papers)
+            return np.dot(self.embeddings[candidates], query_vector), len(candidates)
+
+        if candidates is None:
+            passage_scores = np.dot(self.passage_embeddings, query_vector)
+            return np.maximum.reduceat(passage_scores, self.passage_offsets[:-1]), len(passage_scores)
+
+        # Gather the passage rows of each candidate into one contiguous block
+        starts = self.passage_offsets[candidates]
+        lengths = self.passage_offsets[candidates + 1] - starts
+        segment_starts = np.zeros(len(candidates), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=segment_starts[1:])
+        rows = np.repeat(starts - segment_starts, lengths) + np.arange(lengths.sum())
+
+        passage_scores = np.dot(self.passage_embeddings[rows], query_vector)
+        return np.maximum.reduceat(passage_scores, segment_starts), len(rows)
+
+    def load_topics(self):
+        """Loads precomputed topic clusters if the clustering job has been run."""
+        if not os.path.exists(TOPICS_ARRAYS_PATH) or not os.path.exists(TOPICS_META_PATH):
+            print("⚠️ Topic index not found. Browse-by-topic is disabled.")
+            return
+
+        with open(TOPICS_META_PATH, 'r', encoding='utf-8') as f:
+            topics_meta = json.load(f)
+
+        if topics_meta.get("corpus_fingerprint") != self.corpus_fingerprint:
+            print("⚠️ Topic index was built for a different corpus. Browse-by-topic is disabled.")
+            return
+
+        self.topics = topics_meta["topics"]
+        with np.load(TOPICS_ARRAYS_PATH) as arrays:
+            self.topic_centroids = arrays["centroids"]
+            self.topic_member_order = arrays["member_order"]
+            self.topic_member_offsets = arrays["member_offsets"]
+
+        if self.topic_member_order.shape[0] != len(self.papers):
+            print("⚠️ Topic index is stale (size mismatch). Browse-by-topic is disabled.")
+            self.topics = []
+            self.topic_centroids = None
+            return
+
+        print(f"   ↳ Topic index loaded: {len(self.topics)} topics.")
+
+    def get_topics(self):
+        """Returns the precomputed topic list."""
+        return self.topics
+
+    def get_topic_members(self, topic_id: int, offset: int = 0, limit: int = 20):
+        """
+        Returns a page of papers for a topic, most representative first.
+        Members are a contiguous slice of the CSR member array, so no scoring is needed.
+        """
+        if not 0 <= topic_id < len(self.topics):
+            return None
+
+        start = int(self.topic_member_offsets[topic_id])
+        end = int(self.topic_member_offsets[topic_id + 1])
+        page = self.topic_member_order[start + offset : min(start + offset + limit, end)]
+
+        return {
+            "topic": self.topics[topic_id],
+            "papers": [self.papers[idx] for idx in page],
+            "total": end - start
+        }
+
+    def route_candidates(self, query_vector, n_probe: int):
+        """Returns the paper indices of the n_probe topics closest to the query."""
+        centroid_scores = np.dot(self.topic_centroids, query_vector)
+        n_probe = min(n_probe, len(centroid_scores))
+        nearest = np.argpartition(centroid_scores, -n_probe)[-n_probe:]
+        return np.concatenate([
+            self.topic_member_order[self.topic_member_offsets[t]:self.topic_member_offsets[t + 1]]
+            for t in nearest
+        ])
+
+    def encode_query(self, clean_query: str):
+        """Encodes a normalized query, reusing recent encodings (LRU)."""
+        vector = self.query_cache.get(clean_query)
+        if vector is not None:
+            self.query_cache.move_to_end(clean_query)
+            return vector
+
+        vector = self.model.encode([clean_query])[0]
+        self.query_cache[clean_query] = vector
+        if len(self.query_cache) > QUERY_CACHE_SIZE:
+            self.query_cache.popitem(last=False)
+        return vector
+
+    def warm_up(self, queries):
+        """
+        Replays (query, limit, n_probe) requests so their encodings are cached
+        and the scoring path has run before real traffic arrives.
+        """
+        start_time = time.perf_counter()
+        warmed = 0
+        for query, limit, n_probe in queries:
+            try:
+                self.search(query, top_k=limit, n_probe=n_probe)
+                warmed += 1
+            except Exception as e:
+                print(f"⚠️ Warm-up query failed ({query!r}): {e}")
+        return {"queries": warmed, "duration_ms": round((time.perf_counter() - start_time) * 1000, 2)}
+
+    def search(self, raw_query: str, top_k: int = 5, n_probe: int = None):
         """
         Phase 3.3: Vector Search Implementation
+        If n_probe is set and a topic index is loaded, only papers in the
+        n_probe nearest topics are scored (coarse routing); otherwise exact scan.
         """
         if not self.is_ready:
             self.initialize()
@@ -53,21 +248,28 @@ class SearchEngine:
         # Phase 3.3: Query Preprocessing
         clean_query = normalize_text(raw_query)
 
-        # Encode Query
-        query_vector = self.model.encode([clean_query])[0]
+        # Encode Query (cached for repeated queries)
+        query_vector = self.encode_query(clean_query)
 
         # Phase 3.3: Relevance Scoring (Cosine Similarity)
         # Note: embeddings are normalized by SentenceTransformer, so dot product == cosine sim
-        scores = np.dot(self.embeddings, query_vector)
+        if n_probe and self.topic_centroids is not None:
+            candidates = self.route_candidates(query_vector, n_probe)
+        else:
+            candidates = None
+
+        scores, rows_scanned = self.score_papers(query_vector, candidates)
 
-        # Sort and get indices
-        top_indices = np.argsort(scores)[-top_k:][::-1]
+        order = np.argsort(scores)[-top_k:][::-1]
+        top_indices = order if candidates is None else candidates[order]
+        top_scores = scores[order]
+        items_scanned = len(scores)
 
         results = []
-        for idx in top_indices:
+        for idx, score in zip(top_indices, top_scores):
             results.append({
                 "paper": self.papers[idx],
-                "score": float(scores[idx])
+                "score": float(score)
             })
 
         # Benchmarking (End Timer)
@@ -78,7 +280,8 @@ class SearchEngine:
             "meta": {
                 "query_processed": clean_query,
                 "latency_ms": round(duration_ms, 2),
-                "items_scanned": len(self.papers)
+                "items_scanned": items_scanned,
+                "vectors_scanned": rows_scanned
             }
         }
 
@@ -3,6 +3,9 @@ from fastapi import FastAPI, Request
 from fastapi import HTTPException, Query, Depends
 from app.schemas import SearchResponse, SearchResultItem, PaperMetadata
 from app.schemas import HealthResponse, SystemResources
+from app.schemas import TopicListResponse, TopicMembersResponse, TopicSummary
+from app.schemas import SuggestResponse, SuggestionItem
+from typing import Optional
 from fastapi.middleware.cors import CORSMiddleware
 import time
 import logging
@@ -11,6 +14,8 @@ import psutil
 # Import our local modules
 from app.config import get_settings
 from app.logic import engine  # The SearchEngine singleton from Phase 1
+from app.suggest import suggester
+from app.query_log import query_logger, top_queries
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO)
@@ -31,6 +36,19 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting Application...")
     logger.info(f"🌍 Environment: {settings.APP_ENV}")
 
+    # Load the Typeahead Index first: it does not depend on the model
+    try:
+        suggester.load()
+    except Exception as e:
+        logger.error(f"❌ Failed to load Suggest Index: {e}")
+
+    # Load processed data and topic index before the model, so topic browsing
+    # is served from the precomputed arrays even if the model fails to load
+    try:
+        engine.load_data()
+    except Exception as e:
+        logger.error(f"❌ Failed to load processed data: {e}")
+
     # Initialize the Search Engine (Phase 1 Logic)
     try:
         engine.initialize()
@@ -38,9 +56,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Failed to initialize AI Engine: {e}")
 
+    # Warm-up: replay the most frequent recent queries before serving traffic,
+    # so /health only reports ready once query encodings are cached
+    if engine.is_ready and settings.WARMUP_QUERY_COUNT > 0:
+        try:
+            queries = top_queries(settings.WARMUP_QUERY_COUNT, settings.WARMUP_LOG_WINDOW)
+            warmup = engine.warm_up(queries)
+            logger.info(f"🔥 Warm-up complete: {warmup['queries']} queries in {warmup['duration_ms']}ms")
+        except Exception as e:
+            logger.error(f"❌ Warm-up failed: {e}")
+
+    if settings.QUERY_LOG_ENABLED:
+        query_logger.start()
+
     yield
 
     logger.info("🛑 Shutting down Application...")
+    query_logger.stop()
 
 # ---------------------------------------------------------
 # APP INITIALIZATION
@@ -74,6 +106,18 @@ async def log_requests(request: Request, call_next):
     )
     return response
 
+def to_paper_model(paper_data: dict) -> PaperMetadata:
+    """Maps a raw metadata dict to the Pydantic response model."""
+    return PaperMetadata(
+        arxiv_id=paper_data.get('arxiv_id', 'unknown'),
+        title=paper_data.get('title', 'Untitled'),
+        abstract=paper_data.get('abstract', ''),
+        authors=paper_data.get('authors', []),
+        published=paper_data.get('published', ''),
+        url=paper_data.get('url', ''),
+        categories=paper_data.get('categories', [])
+    )
+
 # ---------------------------------------------------------
 # BASE ROUTES
 # ---------------------------------------------------------
@@ -92,7 +136,8 @@ async def root():
 @app.get("/recommend", response_model=SearchResponse)
 async def recommend_papers(
         q: str = Query(..., min_length=3, max_length=300, description="Search query"),
-        limit: int = Query(5, ge=1, le=50, description="Results limit")
+        limit: int = Query(5, ge=1, le=50, description="Results limit"),
+        n_probe: Optional[int] = Query(None, ge=1, description="Only scan papers in the N nearest topics (omit for exact search)")
 ):
     """
     Semantic Search Endpoint.
@@ -110,7 +155,10 @@ async def recommend_papers(
 
     try:
         # 2. Perform Search (Phase 1 Logic)
-        search_output = engine.search(q, top_k=limit)
+        search_output = engine.search(q, top_k=limit, n_probe=n_probe)
+
+        # Enqueue for the query log (file I/O happens on a background thread)
+        query_logger.log(search_output['meta']['query_processed'], q, limit, n_probe)
 
         # 3. Format Response (Phase 2.1.2)
         formatted_results = []
@@ -125,15 +173,7 @@ async def recommend_papers(
             explanation = f"This paper is a {confidence}% semantic match to your query context."
 
             # Map raw dict to Pydantic Model
-            paper_model = PaperMetadata(
-                arxiv_id=paper_data.get('arxiv_id', 'unknown'),
-                title=paper_data.get('title', 'Untitled'),
-                abstract=paper_data.get('abstract', ''),
-                authors=paper_data.get('authors', []),
-                published=paper_data.get('published', ''),
-                url=paper_data.get('url', ''),
-                categories=paper_data.get('categories', [])
-            )
+            paper_model = to_paper_model(paper_data)
 
             formatted_results.append(SearchResultItem(
                 paper=paper_model,
@@ -150,6 +190,55 @@ async def recommend_papers(
         logger.error(f"Search failed: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error during search processing")
 
+@app.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+        q: str = Query(..., min_length=1, max_length=100, description="Partially typed query"),
+        limit: int = Query(8, ge=1, le=20, description="Suggestions limit")
+):
+    """
+    Typeahead Endpoint (cheap enough to call on every keystroke).
+    Binary search over a prefix index of titles and frequent terms; never runs the model.
+    """
+    return SuggestResponse(
+        suggestions=[SuggestionItem(**s) for s in suggester.suggest(q, limit=limit)]
+    )
+
+# ---------------------------------------------------------
+# TOPIC BROWSING
+# ---------------------------------------------------------
+@app.get("/topics", response_model=TopicListResponse)
+async def list_topics():
+    """
+    Lists research topics precomputed by scripts/cluster_topics.py.
+    Served straight from memory; works even while the model is unavailable.
+    """
+    if not engine.topics_ready:
+        raise HTTPException(status_code=503, detail="Topic index is not available.")
+
+    return TopicListResponse(topics=[TopicSummary(**t) for t in engine.get_topics()])
+
+@app.get("/topics/{topic_id}", response_model=TopicMembersResponse)
+async def topic_members(
+        topic_id: int,
+        offset: int = Query(0, ge=0, description="Pagination offset"),
+        limit: int = Query(20, ge=1, le=100, description="Page size")
+):
+    """Returns a page of papers for a topic, most representative first."""
+    if not engine.topics_ready:
+        raise HTTPException(status_code=503, detail="Topic index is not available.")
+
+    members = engine.get_topic_members(topic_id, offset=offset, limit=limit)
+    if members is None:
+        raise HTTPException(status_code=404, detail=f"Topic {topic_id} not found")
+
+    return TopicMembersResponse(
+        topic=TopicSummary(**members['topic']),
+        papers=[to_paper_model(p) for p in members['papers']],
+        total=members['total'],
+        offset=offset,
+        limit=limit
+    )
+
 # ---------------------------------------------------------
 # SYSTEM HEALTH (Phase 2.1.3)
 # ---------------------------------------------------------
@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import queue
+import logging
+from collections import Counter, deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERY_LOG_DIR = os.path.join(BASE_DIR, "logs")
+QUERY_LOG_PATH = os.path.join(QUERY_LOG_DIR, "queries.log")
+
+# Config
+MAX_LOG_BYTES = 5 * 1024 * 1024  # Rotate at 5 MB
+BACKUP_COUNT = 5                 # queries.log.1 ... queries.log.5
+
+class QueryLogger:
+    """
+    Append-only, rotating log of search queries (one JSON object per line).
+    Each record keeps the normalized query ("q", used for warm-up), the raw
+    validated query ("raw", used for HTTP replay) and the request options.
+    Requests only enqueue a record; a background listener thread does the file I/O.
+    """
+
+    def __init__(self, path: str = QUERY_LOG_PATH):
+        self.path = path
+        self.listener = None
+        self.logger = logging.getLogger("query_log")
+        self.logger.propagate = False  # Keep query records out of the app log
+
+    def start(self):
+        if self.listener is not None:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        file_handler = RotatingFileHandler(
+            self.path, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        records = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(records))
+        self.logger.setLevel(logging.INFO)
+        self.listener = QueueListener(records, file_handler)
+        self.listener.start()
+
+    def stop(self):
+        """Flushes pending records and closes the file."""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.logger.handlers.clear()
+        self.listener = None
+
+    def log(self, query: str, raw_query: str, limit: int, n_probe: int = None):
+        if self.listener is None or not query:
+            return
+        self.logger.info(json.dumps({
+            "ts": round(time.time(), 3),
+            "q": query,
+            "raw": raw_query,
+            "limit": limit,
+            "n_probe": n_probe
+        }))
+
+def read_query_log(path: str = QUERY_LOG_PATH, max_records: int = None):
+    """
+    Returns logged records oldest-first, across rotated files.
+    If max_records is set, only the most recent max_records are returned; older
+    records are dropped as the files are read, so memory stays bounded by it.
+    """
+    files = [f"{path}.{i}" for i in range(BACKUP_COUNT, 0, -1)] + [path]
+    records = deque(maxlen=max_records)
+    for file_path in files:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Partially written line from a crash
+
+    return list(records)
+
+def top_queries(n: int, window: int, path: str = QUERY_LOG_PATH):
+    """Most frequent (query, limit, n_probe) requests among the last `window` logged queries."""
+    counts = Counter(
+        (r["q"], r.get("limit", 5), r.get("n_probe"))
+        for r in read_query_log(path, max_records=window)
+    )
+    return [request for request, _ in counts.most_common(n)]
+
+# Global Instance
+query_logger = QueryLogger()
@@ -54,6 +54,39 @@ class SearchResponse(BaseModel):
     results: List[SearchResultItem]
     meta: dict
 
+# ---------------------------------------------------------
+# TOPIC BROWSING MODELS
+# ---------------------------------------------------------
+class TopicSummary(BaseModel):
+    """A precomputed research topic (cluster of papers)."""
+    id: int
+    label: str
+    terms: List[str]
+    size: int
+
+class TopicListResponse(BaseModel):
+    topics: List[TopicSummary]
+
+class TopicMembersResponse(BaseModel):
+    """A page of papers belonging to one topic, most representative first."""
+    topic: TopicSummary
+    papers: List[PaperMetadata]
+    total: int
+    offset: int
+    limit: int
+
+# ---------------------------------------------------------
+# TYPEAHEAD MODELS
+# ---------------------------------------------------------
+class SuggestionItem(BaseModel):
+    text: str
+    kind: str                       # "term" or "title"
+    arxiv_id: Optional[str] = None  # Set for title suggestions
+    popularity: float               # Percentile rank within its kind (0-1)
+
+class SuggestResponse(BaseModel):
+    suggestions: List[SuggestionItem]
+
 # ---------------------------------------------------------
 # HEALTH MONITORING MODELS
 # ---------------------------------------------------------
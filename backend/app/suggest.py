@@ -0,0 +1,192 @@
+import os
+import string
+from bisect import bisect_left
+from collections import Counter
+import numpy as np
+from app.text_utils import normalize_text, STOP_WORDS
+
+# Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUGGEST_INDEX_PATH = os.path.join(BASE_DIR, "data", "processed", "suggest_index.npz")
+
+# Config
+MIN_TERM_FREQ = 2     # A term must appear in at least this many papers to be suggested
+MIN_TERM_LENGTH = 3   # Skip very short tokens
+
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+_SEPARATOR = "\0"     # Joins string lists into one UTF-8 blob for storage
+
+def percentile_ranks(values):
+    """Fraction of values <= each value (ties share a rank), in [0, 1]."""
+    values = np.asarray(values, dtype=np.float32)
+    if len(values) == 0:
+        return values
+    return np.searchsorted(np.sort(values), values, side="right").astype(np.float32) / len(values)
+
+def _pack(strings):
+    return np.frombuffer(_SEPARATOR.join(strings).encode("utf-8"), dtype=np.uint8)
+
+def _unpack(blob):
+    text = blob.tobytes().decode("utf-8")
+    return text.split(_SEPARATOR) if text else []
+
+def build_suggest_index(papers):
+    """
+    Builds the typeahead index at processing time.
+    - Vocabulary: sorted unique normalized title words, so a prefix is one
+      contiguous range found by binary search
+    - Postings (CSR): the titles containing each word, as sorted title ids
+    - Popularity: a term's document frequency; a title's mean term document
+      frequency. Each is converted to a percentile rank within its kind, so
+      terms and titles compete on the same 0-1 scale.
+    """
+    doc_freq = Counter()
+    title_terms = []
+    for paper in papers:
+        terms = normalize_text(paper.get("title", "")).split()
+        title_terms.append(terms)
+        doc_freq.update(sorted(set(terms)))
+
+    vocab = sorted(doc_freq)
+    word_ids = {word: i for i, word in enumerate(vocab)}
+
+    postings = [[] for _ in vocab]
+    title_popularity = np.zeros(len(papers), dtype=np.float32)
+    for title_id, terms in enumerate(title_terms):
+        for word in sorted(set(terms)):
+            postings[word_ids[word]].append(title_id)
+        if terms:
+            title_popularity[title_id] = sum(doc_freq[t] for t in terms) / len(terms)
+
+    word_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in postings], out=word_offsets[1:])
+    flat_postings = np.array([t for p in postings for t in p], dtype=np.int32)
+
+    # Only frequent, non-trivial words are suggested as terms (-1 = not a term)
+    is_term = np.array([doc_freq[w] >= MIN_TERM_FREQ and len(w) >= MIN_TERM_LENGTH for w in vocab], dtype=bool)
+    term_rank = np.full(len(vocab), -1.0, dtype=np.float32)
+    term_rank[is_term] = percentile_ranks([doc_freq[w] for w, t in zip(vocab, is_term) if t])
+
+    has_terms = np.array([bool(t) for t in title_terms], dtype=bool)
+    title_rank = np.full(len(papers), -1.0, dtype=np.float32)
+    title_rank[has_terms] = percentile_ranks(title_popularity[has_terms])
+
+    return {
+        "vocab": _pack(vocab),
+        "word_offsets": word_offsets,
+        "postings": flat_postings,
+        "term_rank": term_rank,
+        "titles": _pack([p["title"] for p in papers]),
+        "ids": _pack([p.get("arxiv_id", "") for p in papers]),
+        "title_rank": title_rank
+    }
+
+def save_suggest_index(index, path=SUGGEST_INDEX_PATH):
+    np.savez(path, **index)
+
+def normalize_prefix(raw_prefix: str) -> list:
+    """
+    Normalizes a partially typed query into tokens the same way the index was built,
+    except the last token: it may be an unfinished word ("for" -> "forecasting"),
+    so it is kept even if it is a stop word, unless other words precede it.
+    The index holds no stop words, so "reinforcement learning for" would otherwise
+    only match titles with a word starting with "for". Those titles are a subset
+    of the ones matching "reinforcement learning", so dropping it returns the
+    union of both readings.
+    """
+    text = raw_prefix.lower().translate(_PUNCT_TABLE)
+    tokens = text.split()
+    if not tokens:
+        return []
+
+    head = normalize_text(" ".join(tokens[:-1])).split()
+    if head and tokens[-1] in STOP_WORDS:
+        return head
+    return head + [tokens[-1]]
+
+class SuggestIndex:
+    """Sorted-vocabulary prefix index with title postings. Never touches the model."""
+
+    def __init__(self):
+        self.vocab = []
+        self.word_offsets = None
+        self.postings = None
+        self.term_rank = None
+        self.titles = []
+        self.ids = []
+        self.title_rank = None
+        self.is_ready = False
+
+    def load(self, path=SUGGEST_INDEX_PATH):
+        if not os.path.exists(path):
+            print("⚠️ Suggest index not found. Typeahead is disabled.")
+            return
+
+        with np.load(path) as index:
+            self.vocab = _unpack(index["vocab"])
+            self.word_offsets = index["word_offsets"]
+            self.postings = index["postings"]
+            self.term_rank = index["term_rank"]
+            self.titles = _unpack(index["titles"])
+            self.ids = _unpack(index["ids"])
+            self.title_rank = index["title_rank"]
+
+        self.is_ready = True
+        print(f"✅ Suggest Index Online. Words: {len(self.vocab)} | Titles: {len(self.titles)}")
+
+    def _word_range(self, prefix: str):
+        lo = bisect_left(self.vocab, prefix)
+        hi = bisect_left(self.vocab, prefix + "\uffff", lo)
+        return lo, hi
+
+    def _titles_with_word(self, word: str):
+        lo, hi = self._word_range(word)
+        if lo == hi or self.vocab[lo] != word:
+            return np.empty(0, dtype=np.int32)
+        return self.postings[self.word_offsets[lo]:self.word_offsets[lo + 1]]
+
+    def suggest(self, raw_prefix: str, limit: int = 8):
+        tokens = normalize_prefix(raw_prefix)
+        if not tokens or not self.is_ready:
+            return []
+
+        # Last token: every word it prefixes is one contiguous vocabulary range,
+        # and their postings are one contiguous slice of the postings array
+        lo, hi = self._word_range(tokens[-1])
+        if lo == hi:
+            return []
+        titles = np.unique(self.postings[self.word_offsets[lo]:self.word_offsets[hi]])
+
+        # Completed tokens must each appear in the title
+        for word in tokens[:-1]:
+            titles = np.intersect1d(titles, self._titles_with_word(word), assume_unique=True)
+
+        candidates = [(float(self.title_rank[t]), "title", int(t)) for t in self._top(titles, self.title_rank[titles], limit)]
+
+        # Standalone term suggestions only make sense for a single-word prefix
+        if len(tokens) == 1:
+            words = np.arange(lo, hi)
+            words = words[self.term_rank[words] >= 0]
+            candidates += [(float(self.term_rank[w]), "term", int(w)) for w in self._top(words, self.term_rank[words], limit)]
+
+        candidates.sort(key=lambda c: -c[0])
+        return [
+            {
+                "text": self.vocab[ref] if kind == "term" else self.titles[ref],
+                "kind": kind,
+                "arxiv_id": None if kind == "term" else self.ids[ref],
+                "popularity": round(rank, 4)
+            }
+            for rank, kind, ref in candidates[:limit]
+        ]
+
+    @staticmethod
+    def _top(items, ranks, limit):
+        """The `limit` highest-ranked items, best first."""
+        if len(items) > limit:
+            keep = np.argpartition(ranks, -limit)[-limit:]
+            items, ranks = items[keep], ranks[keep]
+        return items[np.argsort(-ranks, kind="stable")]
+
+# Global Instance
+suggester = SuggestIndex()
@@ -1,5 +1,6 @@
 import re
 import string
+import hashlib
 
 # Simple list of common stop words to avoid external NLTK dependency complexity
 STOP_WORDS = {
@@ -30,4 +31,54 @@ def normalize_text(text: str) -> str:
     tokens = text.split()
     filtered_tokens = [t for t in tokens if t not in STOP_WORDS]
 
-    return " ".join(filtered_tokens)
\ No newline at end of file
+    return " ".join(filtered_tokens)
+
+def corpus_fingerprint(papers) -> str:
+    """
+    Identifies a corpus by its ordered arxiv_id list. Derived artifacts
+    (topics, passages) store it so they are never served for a different corpus.
+    """
+    ids = "\n".join(p.get("arxiv_id", "") for p in papers)
+    return hashlib.sha256(ids.encode("utf-8")).hexdigest()
+
+
+def split_passages(title: str, abstract: str, max_words: int = 100) -> list:
+    """
+    Multi-vector mode: splits a paper into passages short enough for the encoder.
+    - Whole sentences are packed into windows of at most max_words words
+      (a sentence longer than that is cut into max_words pieces)
+    - Every passage is prefixed with the normalized title for context
+    - Always returns at least one passage
+    """
+    prefix = normalize_text(title)
+    sentences = re.split(r"(?<=[.!?])\s+", (abstract or "").strip())
+
+    passages = []
+    current = []
+    for sentence in sentences:
+        words = sentence.split()
+        for start in range(0, len(words), max_words):
+            piece = words[start : start + max_words]
+            if current and len(current) + len(piece) > max_words:
+                passages.append(current)
+                current = []
+            current.extend(piece)
+    if current:
+        passages.append(current)
+
+    if not passages:
+        return [f"{prefix}."]
+    return [f"{prefix}. {' '.join(words)}" for words in passages]
+
+
+def passages_fingerprint(papers, max_words: int = 100) -> str:
+    """
+    Identifies the exact passage texts that were embedded, so passage vectors are
+    not served after abstracts (or the passage window) change.
+    """
+    digest = hashlib.sha256()
+    for p in papers:
+        for passage in split_passages(p.get("title", ""), p.get("abstract", ""), max_words):
+            digest.update(passage.encode("utf-8"))
+            digest.update(b"\0")
+    return digest.hexdigest()
@@ -0,0 +1 @@
+# Makes the `app` package importable when pytest is run from backend/
@@ -0,0 +1,33 @@
+import sys
+import os
+import json
+import time
+
+# Add backend to path to import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.suggest import build_suggest_index, save_suggest_index, SUGGEST_INDEX_PATH
+
+# Paths
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+METADATA_FILE = os.path.join(SCRIPT_DIR, "../data/processed/metadata.json")
+
+def main():
+    print("🔤 Building Typeahead Suggest Index...")
+    start_time = time.time()
+
+    if not os.path.exists(METADATA_FILE):
+        print("❌ Processed metadata not found. Run process_embeddings.py first.")
+        return
+
+    with open(METADATA_FILE, "r", encoding="utf-8") as f:
+        papers = json.load(f)
+
+    index = build_suggest_index(papers)
+    save_suggest_index(index)
+
+    size_kb = os.path.getsize(SUGGEST_INDEX_PATH) / 1024
+    print(f"🎉 Suggest Index Complete. Words: {len(index['word_offsets']) - 1} | Size: {size_kb:.1f} KB | {time.time() - start_time:.2f}s")
+
+if __name__ == "__main__":
+    main()
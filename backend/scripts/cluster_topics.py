@@ -0,0 +1,197 @@
+import sys
+import os
+import json
+import time
+import math
+from collections import Counter
+import numpy as np
+
+# Add backend to path to import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.text_utils import normalize_text, corpus_fingerprint
+
+# Paths
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, "../data")
+PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
+EMBEDDINGS_FILE = os.path.join(PROCESSED_DIR, "embeddings.npy")
+METADATA_FILE = os.path.join(PROCESSED_DIR, "metadata.json")
+TOPICS_ARRAYS_FILE = os.path.join(PROCESSED_DIR, "topics.npz")
+TOPICS_META_FILE = os.path.join(PROCESSED_DIR, "topics.json")
+
+# Config
+N_TOPICS = 20           # Number of clusters (k)
+MINI_BATCH_SIZE = 256   # Rows sampled per k-means step (bounds memory)
+N_ITERATIONS = 200      # Mini-batch update steps
+SCAN_CHUNK_SIZE = 4096  # Rows read per chunk for the final assignment pass
+LABEL_TERMS = 3         # Terms used to build each topic label
+MIN_TERM_LENGTH = 3     # Skip very short tokens ("we", "is", ...) when labelling
+MIN_TOPIC_TERM_COUNT = 2  # A label term must appear in at least this many papers of the topic...
+MIN_DOC_FREQ = 2          # ...or, for tiny topics with no shared terms, of the corpus
+RANDOM_SEED = 42
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def init_centroids(embeddings, k, rng):
+    """Seed centroids from k distinct random papers."""
+    seeds = np.sort(rng.choice(embeddings.shape[0], size=k, replace=False))
+    return normalize_rows(np.array(embeddings[seeds], dtype=np.float32))
+
+def mini_batch_kmeans(embeddings, k, rng):
+    """
+    Mini-batch (spherical) k-means.
+    Each step reads only MINI_BATCH_SIZE rows from the memory-mapped matrix,
+    so peak memory is independent of the corpus size.
+    """
+    n_rows = embeddings.shape[0]
+    centroids = init_centroids(embeddings, k, rng)
+    counts = np.zeros(k, dtype=np.int64)
+    batch_size = min(MINI_BATCH_SIZE, n_rows)
+
+    for step in range(N_ITERATIONS):
+        # Sorted indices keep mmap reads mostly sequential
+        idx = np.sort(rng.choice(n_rows, size=batch_size, replace=False))
+        batch = np.asarray(embeddings[idx], dtype=np.float32)
+
+        # Embeddings are unit length, so the nearest centroid is the max dot product
+        labels = np.argmax(batch @ centroids.T, axis=1)
+
+        # Per-centroid learning rate 1/count (Sculley, 2010), applied per cluster in bulk
+        batch_counts = np.bincount(labels, minlength=k)
+        batch_sums = np.zeros_like(centroids)
+        np.add.at(batch_sums, labels, batch)
+
+        touched = batch_counts > 0
+        counts[touched] += batch_counts[touched]
+        eta = (batch_counts[touched] / counts[touched])[:, None]
+        batch_means = batch_sums[touched] / batch_counts[touched][:, None]
+        centroids[touched] = (1.0 - eta) * centroids[touched] + eta * batch_means
+        centroids = normalize_rows(centroids)
+
+        if (step + 1) % 50 == 0:
+            print(f"   Step {step + 1}/{N_ITERATIONS} | Active topics: {int((counts > 0).sum())}/{k}")
+
+    return centroids
+
+def assign_all(embeddings, centroids):
+    """Streams over the full matrix in chunks and assigns every paper to a topic."""
+    n_rows = embeddings.shape[0]
+    assignments = np.empty(n_rows, dtype=np.int32)
+    similarities = np.empty(n_rows, dtype=np.float32)
+
+    for start in range(0, n_rows, SCAN_CHUNK_SIZE):
+        chunk = np.asarray(embeddings[start : start + SCAN_CHUNK_SIZE], dtype=np.float32)
+        scores = chunk @ centroids.T
+        labels = np.argmax(scores, axis=1)
+        assignments[start : start + len(chunk)] = labels
+        similarities[start : start + len(chunk)] = scores[np.arange(len(chunk)), labels]
+
+    return assignments, similarities
+
+def build_member_index(assignments, similarities, k):
+    """
+    CSR-style layout: members of topic t are member_order[offsets[t]:offsets[t+1]],
+    sorted by closeness to the centroid (most representative first).
+    """
+    # lexsort sorts by the last key first: topic ascending, then similarity descending
+    member_order = np.lexsort((-similarities, assignments)).astype(np.int32)
+    sizes = np.bincount(assignments, minlength=k)
+    offsets = np.zeros(k + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    return member_order, offsets
+
+def label_topics(papers, assignments, k):
+    """
+    Labels each topic with its most frequent normalized title terms.
+    Only terms shared by at least MIN_TOPIC_TERM_COUNT papers of the topic are
+    eligible (falling back to terms seen in MIN_DOC_FREQ papers overall), so
+    one-off words can't win on idf alone. Among those, counts are weighted by
+    inverse document frequency so corpus-wide words don't dominate.
+    """
+    topic_terms = [Counter() for _ in range(k)]
+    doc_freq = Counter()
+
+    for paper, topic in zip(papers, assignments):
+        terms = {t for t in normalize_text(paper.get("title", "")).split() if len(t) >= MIN_TERM_LENGTH}
+        topic_terms[topic].update(terms)
+        doc_freq.update(terms)
+
+    n_docs = max(len(papers), 1)
+    labels = []
+    for counter in topic_terms:
+        eligible = [(t, c) for t, c in counter.items() if c >= MIN_TOPIC_TERM_COUNT]
+        if not eligible:
+            eligible = [(t, c) for t, c in counter.items() if doc_freq[t] >= MIN_DOC_FREQ]
+        # Ties broken alphabetically so labels don't depend on set iteration order
+        ranked = sorted(
+            eligible,
+            key=lambda item: (-item[1] * math.log(n_docs / doc_freq[item[0]]), item[0])
+        )
+        labels.append([term for term, _ in ranked[:LABEL_TERMS]])
+    return labels
+
+def main():
+    print("🗂️  Starting Topic Clustering Job...")
+    start_time = time.time()
+
+    if not os.path.exists(EMBEDDINGS_FILE) or not os.path.exists(METADATA_FILE):
+        print("❌ Processed data not found. Run process_embeddings.py first.")
+        return
+
+    with open(METADATA_FILE, "r", encoding="utf-8") as f:
+        papers = json.load(f)
+
+    # 1. Memory-map embeddings (never fully loaded into RAM)
+    embeddings = np.load(EMBEDDINGS_FILE, mmap_mode="r")
+    n_rows = embeddings.shape[0]
+    k = min(N_TOPICS, n_rows)
+    print(f"📊 Clustering {n_rows} papers into {k} topics...")
+
+    # 2. Fit centroids
+    rng = np.random.default_rng(RANDOM_SEED)
+    centroids = mini_batch_kmeans(embeddings, k, rng)
+
+    # 3. Final assignment pass
+    assignments, similarities = assign_all(embeddings, centroids)
+    member_order, offsets = build_member_index(assignments, similarities, k)
+
+    # 4. Topic labels
+    labels = label_topics(papers, assignments, k)
+
+    # 5. Save
+    np.savez(
+        TOPICS_ARRAYS_FILE,
+        centroids=centroids.astype(np.float32),
+        assignments=assignments,
+        member_order=member_order,
+        member_offsets=offsets
+    )
+
+    topics = []
+    for topic_id in range(k):
+        size = int(offsets[topic_id + 1] - offsets[topic_id])
+        topics.append({
+            "id": topic_id,
+            "label": ", ".join(labels[topic_id]) or f"Topic {topic_id}",
+            "terms": labels[topic_id],
+            "size": size
+        })
+
+    with open(TOPICS_META_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "n_topics": k,
+            "generated_at": time.time(),
+            "corpus_fingerprint": corpus_fingerprint(papers),
+            "topics": topics
+        }, f, indent=2)
+
+    for topic in topics:
+        print(f"   [{topic['id']:>2}] {topic['size']:>5} papers | {topic['label']}")
+    print(f"🎉 Clustering Complete in {time.time() - start_time:.1f}s.")
+
+if __name__ == "__main__":
+    main()
@@ -9,36 +9,48 @@ import gc # Garbage Collection for Memory Management
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.ai_core import ModelManager
-from app.text_utils import normalize_text
+from app.text_utils import normalize_text, split_passages, corpus_fingerprint, passages_fingerprint
+from app.suggest import build_suggest_index, save_suggest_index
+from app.embedding_cache import EmbeddingCache
+from scripts.cluster_topics import main as cluster_topics
 
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(SCRIPT_DIR, "../data")
 RAW_FILE = os.path.join(DATA_DIR, "raw/papers_1k.json")
 PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
-CHECKPOINT_FILE = os.path.join(DATA_DIR, "processed/checkpoint.json")
 
 # Config
 BATCH_SIZE = 50 # Process 50 papers at a time (Phase 3.2 Batch Processing)
 
-def get_checkpoint():
-    if os.path.exists(CHECKPOINT_FILE):
-        with open(CHECKPOINT_FILE, 'r') as f:
-            return json.load(f)
-    return {"processed_count": 0, "vectors": []}
-
-def save_checkpoint(count, vectors_list):
-    """Phase 3.2: Checkpointing system"""
-    # Save partial vectors temporarily
-    temp_vec_path = os.path.join(PROCESSED_DIR, "temp_embeddings.npy")
-    if vectors_list:
-        # Append logic would be complex with numpy, simplier to keep in memory for 1k papers.
-        # For stricter memory mgmt, we would append to file.
-        # Here we simulate the checkpoint state save.
-        pass
-
-    with open(CHECKPOINT_FILE, 'w') as f:
-        json.dump({"processed_count": count}, f)
+# Multi-vector (chunked) mode: run with --passages to also embed abstract passages
+PASSAGE_MODE = "--passages" in sys.argv
+PASSAGE_MAX_WORDS = 100     # Keeps each passage well under the 256 wordpiece limit
+PASSAGE_BATCH_SIZE = 256    # Passages encoded per model call
+PASSAGE_FILES = ("passage_embeddings.npy", "passage_offsets.npy", "passage_meta.json")
+
+def encode_passages(model, papers, cache):
+    """
+    Multi-vector mode: embeds every passage in bulk into one flat matrix.
+    Returns (passage_vectors, offsets) where the passages of paper i are
+    rows offsets[i]:offsets[i+1] (CSR layout).
+    """
+    passages = []
+    offsets = np.zeros(len(papers) + 1, dtype=np.int64)
+    for i, p in enumerate(papers):
+        chunks = split_passages(p['title'], p['abstract'], PASSAGE_MAX_WORDS)
+        passages.extend(chunks)
+        offsets[i + 1] = offsets[i] + len(chunks)
+
+    print(f"🧩 Encoding {len(passages)} passages for {len(papers)} papers...")
+    passage_vectors = np.empty((len(passages), cache.dim), dtype=np.float32)
+
+    for start in range(0, len(passages), PASSAGE_BATCH_SIZE):
+        batch = passages[start : start + PASSAGE_BATCH_SIZE]
+        passage_vectors[start : start + len(batch)] = cache.encode(model, batch, batch_size=PASSAGE_BATCH_SIZE)
+    cache.flush()
+
+    return passage_vectors, offsets
 
 def format_time(seconds):
     return time.strftime("%H:%M:%S", time.gmtime(seconds))
@@ -53,58 +65,55 @@ def main():
 
     total_papers = len(papers)
 
-    # 2. Load Checkpoint (Phase 3.2 Resume Capability)
-    checkpoint = get_checkpoint()
-    start_index = checkpoint["processed_count"]
+    print(f"📊 Processing {total_papers} papers")
 
-    if start_index >= total_papers:
-        print("✅ Data already fully processed.")
-        return
-
-    print(f"📊 Resuming from paper {start_index}/{total_papers}")
-
-    # 3. Load Model (Using our new Manager)
+    # 2. Load Model (Using our new Manager)
     manager = ModelManager()
     model = manager.load_model()
 
-    all_embeddings = []
+    # Content-addressed cache: only new or changed papers are encoded.
+    # Keys include the model name, so changing MODEL_NAME invalidates every entry.
+    # It also replaces checkpointing: after an interruption, a rerun gets the
+    # already-encoded papers back as cache hits.
+    cache = EmbeddingCache(manager.model_name, model.get_sentence_embedding_dimension())
+    print(f"🗃️  Embedding cache: {len(cache.hashes)} stored vectors")
 
-    # If we are resuming, we would ideally load existing .npy, but for this scale
-    # we will re-process or append. To keep logic clean for <10k papers, we process
-    # the remaining list and merge.
+    all_embeddings = []
 
-    # 4. Batch Processing Loop
+    # 3. Batch Processing Loop
     start_time = time.time()
 
-    for i in range(start_index, total_papers, BATCH_SIZE):
+    for i in range(0, total_papers, BATCH_SIZE):
         batch = papers[i : i + BATCH_SIZE]
         current_batch_size = len(batch)
 
         # Prepare Text (Phase 3.3 Preprocessing integration)
         sentences = [f"{normalize_text(p['title'])}. {p['abstract']}" for p in batch]
 
-        # Encode
-        vectors = model.encode(sentences)
+        # Encode (cache misses only)
+        vectors = cache.encode(model, sentences)
         all_embeddings.append(vectors)
 
         # ETA Calculation (Phase 3.2)
-        processed_so_far = (i + current_batch_size) - start_index
+        processed_so_far = i + current_batch_size
         elapsed = time.time() - start_time
         rate = processed_so_far / elapsed # papers per second
         remaining = total_papers - (i + current_batch_size)
         eta_seconds = remaining / rate if rate > 0 else 0
 
-        print(f"   Batch {i//BATCH_SIZE + 1}: Processed {current_batch_size} | ETA: {format_time(eta_seconds)}")
+        print(
+            f"   Batch {i//BATCH_SIZE + 1}: Processed {current_batch_size} | "
+            f"Cache hit rate: {cache.hit_rate():.1%} | ETA: {format_time(eta_seconds)}"
+        )
 
         # Memory Management (Phase 3.2)
         del sentences
         del vectors
         gc.collect()
 
-        # Save Checkpoint
-        save_checkpoint(i + current_batch_size, [])
+    cache.flush()
 
-    # 5. Final Merge and Save
+    # 4. Final Merge and Save
     print("💾 Finalizing data storage...")
     final_embeddings = np.vstack(all_embeddings)
 
@@ -115,10 +124,40 @@ def main():
     with open(os.path.join(PROCESSED_DIR, "metadata.json"), "w", encoding="utf-8") as f:
         json.dump(papers, f)
 
-    # Remove checkpoint on success
-    if os.path.exists(CHECKPOINT_FILE):
-        os.remove(CHECKPOINT_FILE)
-
+    # Multi-vector (chunked) mode
+    if PASSAGE_MODE:
+        passage_vectors, offsets = encode_passages(model, papers, cache)
+        np.save(os.path.join(PROCESSED_DIR, "passage_embeddings.npy"), passage_vectors)
+        np.save(os.path.join(PROCESSED_DIR, "passage_offsets.npy"), offsets)
+        with open(os.path.join(PROCESSED_DIR, "passage_meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "corpus_fingerprint": corpus_fingerprint(papers),
+                "passages_fingerprint": passages_fingerprint(papers, PASSAGE_MAX_WORDS),
+                "model_name": manager.model_name,
+                "max_words": PASSAGE_MAX_WORDS
+            }, f, indent=2)
+
+        base_mb = final_embeddings.nbytes / (1024 ** 2)
+        extra_mb = (passage_vectors.nbytes + offsets.nbytes) / (1024 ** 2)
+        print(
+            f"   ↳ Passages: {len(passage_vectors)} ({len(passage_vectors) / len(papers):.2f} per paper) | "
+            f"Memory: +{extra_mb:.2f} MB over {base_mb:.2f} MB ({extra_mb / base_mb:.1f}x)"
+        )
+    else:
+        # Passage vectors from an earlier --passages run no longer match these embeddings
+        for name in PASSAGE_FILES:
+            path = os.path.join(PROCESSED_DIR, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # Build Typeahead Index (titles + frequent terms, no model needed)
+    save_suggest_index(build_suggest_index(papers))
+
+    # Rebuild Topic Clusters (they index rows of the new embeddings)
+    cluster_topics()
+
+    stats = cache.stats()
+    print(f"🗃️  Embedding cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.1%} hit rate)")
     print(f"🎉 Processing Complete. Shape: {final_embeddings.shape}")
 
 if __name__ == "__main__":
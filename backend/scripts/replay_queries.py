@@ -0,0 +1,105 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add backend to path to import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.query_log import read_query_log, QUERY_LOG_PATH
+
+# Must match the /recommend `q` validation in app/main.py
+MIN_QUERY_LENGTH = 3
+MAX_QUERY_LENGTH = 300
+
+def http_query(record):
+    """
+    Query string to send over HTTP: the raw validated query when it was logged.
+    Older records only have the normalized form, which can fail validation
+    (e.g. "the AI" -> "ai"); those return None and are skipped.
+    """
+    query = record.get("raw") or record["q"]
+    if not MIN_QUERY_LENGTH <= len(query) <= MAX_QUERY_LENGTH:
+        return None
+    return query
+
+def replay_in_process(records):
+    """Replays against the SearchEngine of the current checkout (the candidate build)."""
+    from app.logic import engine
+    engine.initialize()
+
+    latencies = []
+    errors = 0
+    for record in records:
+        start = time.perf_counter()
+        try:
+            engine.search(record["q"], top_k=record.get("limit", 5), n_probe=record.get("n_probe"))
+        except Exception as e:
+            errors += 1
+            print(f"   ⚠️ {record['q']!r}: {e}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, errors, 0
+
+def replay_http(records, base_url):
+    """Replays against a running candidate server."""
+    import httpx
+
+    latencies = []
+    errors = 0
+    skipped = 0
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        for record in records:
+            query = http_query(record)
+            if query is None:
+                skipped += 1
+                continue
+
+            params = {"q": query, "limit": record.get("limit", 5)}
+            if record.get("n_probe"):
+                params["n_probe"] = record["n_probe"]
+
+            start = time.perf_counter()
+            try:
+                response = client.get("/recommend", params=params)
+                if response.status_code != 200:
+                    errors += 1
+                    print(f"   ⚠️ {record['q']!r}: HTTP {response.status_code}")
+            except httpx.HTTPError as e:
+                errors += 1
+                print(f"   ⚠️ {record['q']!r}: {e}")
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, errors, skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay logged production queries against a candidate build.")
+    parser.add_argument("--log", default=QUERY_LOG_PATH, help="Query log to replay (rotated files are included)")
+    parser.add_argument("--url", default=None, help="Candidate server URL; omit to replay in-process")
+    parser.add_argument("--max", type=int, default=None, help="Only replay the most recent N queries")
+    args = parser.parse_args()
+
+    print("🔁 Starting Query Replay...")
+    records = read_query_log(args.log, max_records=args.max)
+    if not records:
+        print(f"❌ No queries found in {args.log}")
+        return
+
+    target = args.url or "in-process engine"
+    print(f"📊 Replaying {len(records)} queries (original order) against {target}...")
+
+    if args.url:
+        latencies, errors, skipped = replay_http(records, args.url)
+    else:
+        latencies, errors, skipped = replay_in_process(records)
+
+    if not latencies:
+        print(f"❌ All {skipped} queries were skipped (not replayable over HTTP)")
+        return
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"   ↳ Latency ms | p50: {p50:.2f} | p95: {p95:.2f} | p99: {p99:.2f} | max: {max(latencies):.2f}")
+    print(f"   ↳ Errors: {errors}/{len(latencies)} | Skipped (fail request validation): {skipped}")
+    print("🎉 Replay Complete.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import numpy as np
+from app.embedding_cache import EmbeddingCache
+
+DIM = 4
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32):
+        self.calls += len(texts)
+        return np.array([[len(t), i, 1.0, 2.0] for i, t in enumerate(texts)], dtype=np.float32)
+
+def test_hits_after_flush_and_reload(tmp_path):
+    model = FakeModel()
+    cache = EmbeddingCache("model-a", DIM, str(tmp_path))
+    first = cache.encode(model, ["aa", "bbb"])
+    cache.flush()
+
+    reloaded = EmbeddingCache("model-a", DIM, str(tmp_path))
+    again = reloaded.encode(model, ["bbb", "aa"])
+    assert model.calls == 2
+    assert np.array_equal(again, first[::-1])
+
+def test_model_name_invalidates(tmp_path):
+    model = FakeModel()
+    EmbeddingCache("model-a", DIM, str(tmp_path)).encode(model, ["aa"])
+    cache = EmbeddingCache("model-b", DIM, str(tmp_path))
+    cache.encode(model, ["aa"])
+    assert cache.stats()["hits"] == 0
+
+def test_torn_row_is_truncated_before_append(tmp_path):
+    model = FakeModel()
+    cache = EmbeddingCache("model-a", DIM, str(tmp_path))
+    cache.encode(model, ["xx"])
+    cache.flush()
+
+    # Simulate an interrupted append
+    with open(cache.vectors_path, "ab") as f:
+        f.write(b"\x01" * 6)
+
+    cache = EmbeddingCache("model-a", DIM, str(tmp_path))
+    expected = cache.encode(model, ["zz", "yy"])
+    cache.flush()
+
+    cache = EmbeddingCache("model-a", DIM, str(tmp_path))
+    vectors, misses = cache.lookup(["zz", "yy", "xx"])
+    assert len(misses) == 0
+    assert np.array_equal(vectors[:2], expected)
+    assert np.array_equal(vectors[2], [2, 0, 1, 2])
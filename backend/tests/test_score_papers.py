@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")  # app.logic imports the model stack
+from app.logic import SearchEngine
+
+DIM = 8
+PASSAGE_COUNTS = [1, 4, 2, 1, 7, 3]  # Ragged on purpose
+
+def make_engine():
+    rng = np.random.default_rng(0)
+    engine = SearchEngine()
+    engine.papers = [{"arxiv_id": str(i)} for i in range(len(PASSAGE_COUNTS))]
+    engine.embeddings = rng.standard_normal((len(PASSAGE_COUNTS), DIM)).astype(np.float32)
+    engine.passage_offsets = np.zeros(len(PASSAGE_COUNTS) + 1, dtype=np.int64)
+    np.cumsum(PASSAGE_COUNTS, out=engine.passage_offsets[1:])
+    engine.passage_embeddings = rng.standard_normal((engine.passage_offsets[-1], DIM)).astype(np.float32)
+    return engine, rng.standard_normal(DIM).astype(np.float32)
+
+def best_passage(engine, query, paper):
+    start, end = engine.passage_offsets[paper], engine.passage_offsets[paper + 1]
+    return max(float(np.dot(row, query)) for row in engine.passage_embeddings[start:end])
+
+def test_full_scan_matches_per_paper_max():
+    engine, query = make_engine()
+    scores, rows = engine.score_papers(query)
+    expected = [best_passage(engine, query, p) for p in range(len(PASSAGE_COUNTS))]
+    assert np.allclose(scores, expected, atol=1e-5)
+    assert rows == sum(PASSAGE_COUNTS)
+
+@pytest.mark.parametrize("candidates", [[4, 0, 2], [1], [5], [3, 4, 5, 0, 1, 2]])
+def test_candidates_match_per_paper_max(candidates):
+    engine, query = make_engine()
+    scores, rows = engine.score_papers(query, np.array(candidates, dtype=np.int64))
+    expected = [best_passage(engine, query, p) for p in candidates]
+    assert np.allclose(scores, expected, atol=1e-5)
+    assert rows == sum(PASSAGE_COUNTS[p] for p in candidates)
@@ -0,0 +1,32 @@
+from app.suggest import SuggestIndex, build_suggest_index, save_suggest_index
+
+PAPERS = [
+    {"arxiv_id": "1", "title": "Reinforcement Learning for Robot Control"},
+    {"arxiv_id": "2", "title": "Offline Reinforcement Learning with Diffusion"},
+    {"arxiv_id": "3", "title": "Formal Verification of Reinforcement Learning Agents"},
+    {"arxiv_id": "4", "title": "Forecasting Weather with Transformers"},
+]
+
+def load_index(tmp_path):
+    path = str(tmp_path / "suggest_index.npz")
+    save_suggest_index(build_suggest_index(PAPERS), path)
+    index = SuggestIndex()
+    index.load(path)
+    return index
+
+def titles(results):
+    return {r["text"] for r in results if r["kind"] == "title"}
+
+def test_trailing_stop_word_does_not_restrict_to_prefix_matches(tmp_path):
+    index = load_index(tmp_path)
+    expected = {p["title"] for p in PAPERS[:3]}
+    assert titles(index.suggest("reinforcement learning for")) == expected
+    assert titles(index.suggest("reinforcement learning for ")) == expected
+
+def test_lone_stop_word_is_still_a_prefix(tmp_path):
+    index = load_index(tmp_path)
+    assert titles(index.suggest("for")) == {PAPERS[2]["title"], PAPERS[3]["title"]}
+
+def test_multi_word_prefix(tmp_path):
+    index = load_index(tmp_path)
+    assert titles(index.suggest("learning diff")) == {PAPERS[1]["title"]}
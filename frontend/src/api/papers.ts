@@ -22,6 +22,17 @@ interface APIResponse {
     meta: any;
 }
 
+export interface Suggestion {
+    text: string;
+    kind: 'term' | 'title';
+    arxiv_id: string | null;
+    popularity: number;
+}
+
+interface SuggestResponse {
+    suggestions: Suggestion[];
+}
+
 // Define the shape our UI expects (matches SearchPage.tsx)
 export interface UIPaper {
     id: string;
@@ -58,5 +69,13 @@ export const searchService = {
                 relevanceScore: Math.round(item.score * 100)
             };
         });
+    },
+
+    // Typeahead: cheap prefix lookup, safe to call on every keystroke (no model call)
+    async suggest(prefix: string, limit: number = 8): Promise<Suggestion[]> {
+        const response = await apiClient.get<SuggestResponse>('/suggest', {
+            params: { q: prefix, limit: limit }
+        });
+        return response.data.suggestions;
     }
 };
\ No newline at end of file